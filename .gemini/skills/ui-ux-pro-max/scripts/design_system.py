@@ -13,12 +13,11 @@ Usage:
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
 """
 
-import csv
 import json
 import os
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, DATA_DIR, load_csv
 
 
 # ============ CONFIGURATION ============
@@ -32,6 +31,28 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Page type detection: (context keywords, page type), first match wins
+PAGE_TYPE_PATTERNS = [
+    (["dashboard", "admin", "analytics", "data", "metrics", "stats", "monitor", "overview"], "Dashboard / Data View"),
+    (["checkout", "payment", "cart", "purchase", "order", "billing"], "Checkout / Payment"),
+    (["settings", "profile", "account", "preferences", "config"], "Settings / Profile"),
+    (["landing", "marketing", "homepage", "hero", "home", "promo"], "Landing / Marketing"),
+    (["login", "signin", "signup", "register", "auth", "password"], "Authentication"),
+    (["pricing", "plans", "subscription", "tiers", "packages"], "Pricing / Plans"),
+    (["blog", "article", "post", "news", "content", "story"], "Blog / Article"),
+    (["product", "item", "detail", "pdp", "shop", "store"], "Product Detail"),
+    (["search", "results", "browse", "filter", "catalog", "list"], "Search Results"),
+    (["empty", "404", "error", "not found", "zero"], "Empty State"),
+]
+
+
+def _load_reasoning_rules() -> tuple:
+    """Load read-only reasoning rules via core's CSV cache (re-read only when the file changes)."""
+    try:
+        return load_csv(DATA_DIR / REASONING_FILE)
+    except FileNotFoundError:
+        return ()
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
@@ -39,19 +60,40 @@ class DesignSystemGenerator:
 
     def __init__(self):
         self.reasoning_data = self._load_reasoning()
-
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
-
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+        self._indexed_rules = None
+        self._rules_by_category = {}
+        self._rule_keys = []
+
+    def _load_reasoning(self) -> tuple:
+        """Load reasoning rules from CSV (shared across instances)."""
+        return _load_reasoning_rules()
+
+    def _rule_index(self) -> tuple:
+        """Index reasoning rules by lowercased UI_Category (rebuilt when the rules change).
+
+        Returns (rules_by_category, rule_keys) where rule_keys is a list of
+        (category_lower, category_keywords, rule) in CSV order.
+        """
+        if self._indexed_rules is not self.reasoning_data:
+            rules_by_category = {}
+            rule_keys = []
+            for rule in self.reasoning_data:
+                ui_cat = rule.get("UI_Category", "").lower()
+                # First rule wins, matching the old linear scan
+                rules_by_category.setdefault(ui_cat, rule)
+                keywords = ui_cat.replace("/", " ").replace("-", " ").split()
+                rule_keys.append((ui_cat, keywords, rule))
+            self._rules_by_category = rules_by_category
+            self._rule_keys = rule_keys
+            self._indexed_rules = self.reasoning_data
+        return self._rules_by_category, self._rule_keys
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, known_results: dict = None) -> dict:
+        """Execute searches across multiple domains, skipping domains in known_results."""
+        results = dict(known_results or {})
         for domain, config in SEARCH_CONFIG.items():
+            if domain in results:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
@@ -65,21 +107,20 @@ class DesignSystemGenerator:
         """Find matching reasoning rule for a category."""
         category_lower = category.lower()
 
+        rules_by_category, rule_keys = self._rule_index()
+
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
+        rule = rules_by_category.get(category_lower)
+        if rule is not None:
+            return rule
 
         # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
+        for ui_cat, _, rule in rule_keys:
             if ui_cat in category_lower or category_lower in ui_cat:
                 return rule
 
         # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
+        for _, keywords, rule in rule_keys:
             if any(kw in category_lower for kw in keywords):
                 return rule
 
@@ -127,26 +168,29 @@ class DesignSystemGenerator:
         if not priority_keywords:
             return results[0]
 
+        # Normalize priority keywords once, not per result
+        priority_lower_list = [kw.lower().strip() for kw in priority_keywords]
+        # Lowercase each result's style name once, shared by both passes
+        style_names = [result.get("Style Category", "").lower() for result in results]
+
         # First: try exact style name match
-        for priority in priority_keywords:
-            priority_lower = priority.lower().strip()
-            for result in results:
-                style_name = result.get("Style Category", "").lower()
+        for priority_lower in priority_lower_list:
+            for result, style_name in zip(results, style_names):
                 if priority_lower in style_name or style_name in priority_lower:
                     return result
 
         # Second: score by keyword match in all fields
         scored = []
-        for result in results:
+        for result, style_name in zip(results, style_names):
+            keywords_lower = result.get("Keywords", "").lower()
             result_str = str(result).lower()
             score = 0
-            for kw in priority_keywords:
-                kw_lower = kw.lower().strip()
+            for kw_lower in priority_lower_list:
                 # Higher score for style name match
-                if kw_lower in result.get("Style Category", "").lower():
+                if kw_lower in style_name:
                     score += 10
                 # Lower score for keyword field match
-                elif kw_lower in result.get("Keywords", "").lower():
+                elif kw_lower in keywords_lower:
                     score += 3
                 # Even lower for other field matches
                 elif kw_lower in result_str:
@@ -162,6 +206,9 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        # Pick up edits to the reasoning CSV (a cache hit when unchanged)
+        self.reasoning_data = self._load_reasoning()
+
         # Step 1: First search product to get category
         product_result = search(query, "product", 1)
         product_results = product_result.get("results", [])
@@ -174,8 +221,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        search_results = self._multi_domain_search(query, style_priority, {"product": product_result})
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -239,6 +285,25 @@ class DesignSystemGenerator:
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
 
+def _wrap_text(text: str, prefix: str, width: int) -> list:
+    """Wrap long text into multiple lines."""
+    if not text:
+        return []
+    words = text.split()
+    lines = []
+    current_line = prefix
+    for word in words:
+        if len(current_line) + len(word) + 1 <= width - 2:
+            current_line += (" " if current_line != prefix else "") + word
+        else:
+            if current_line != prefix:
+                lines.append(current_line)
+            current_line = prefix + word
+    if current_line != prefix:
+        lines.append(current_line)
+    return lines
+
+
 def format_ascii_box(design_system: dict) -> str:
     """Format design system as ASCII box with emojis (MCP-style)."""
     project = design_system.get("project_name", "PROJECT")
@@ -249,24 +314,6 @@ def format_ascii_box(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
-
     # Build sections from pattern
     sections = pattern.get("sections", "").split(">")
     sections = [s.strip() for s in sections if s.strip()]
@@ -294,10 +341,10 @@ def format_ascii_box(design_system: dict) -> str:
     # Style section
     lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
     if style.get("keywords"):
-        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
+        for line in _wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
     if style.get("best_for"):
-        for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
+        for line in _wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
     if style.get("performance") or style.get("accessibility"):
         perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
@@ -312,17 +359,17 @@ def format_ascii_box(design_system: dict) -> str:
     lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
     lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
     if colors.get("notes"):
-        for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
+        for line in _wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
     lines.append("|" + " " * BOX_WIDTH + "|")
 
     # Typography section
     lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
     if typography.get("mood"):
-        for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
+        for line in _wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
     if typography.get("best_for"):
-        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
+        for line in _wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
     if typography.get("google_fonts_url"):
         lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
@@ -333,14 +380,14 @@ def format_ascii_box(design_system: dict) -> str:
     # Key Effects section
     if effects:
         lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(effects, "|     ", BOX_WIDTH):
+        for line in _wrap_text(effects, "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
         lines.append("|" + " " * BOX_WIDTH + "|")
 
     # Anti-patterns section
     if anti_patterns:
         lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
+        for line in _wrap_text(anti_patterns, "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
         lines.append("|" + " " * BOX_WIDTH + "|")
 
@@ -458,6 +505,17 @@ def format_markdown(design_system: dict) -> str:
 
 
 # ============ MAIN ENTRY POINT ============
+_default_generator = None
+
+
+def _get_generator() -> DesignSystemGenerator:
+    """Return the shared generator used by generate_design_system."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = DesignSystemGenerator()
+    return _default_generator
+
+
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
                            persist: bool = False, page: str = None, output_dir: str = None) -> str:
     """
@@ -474,8 +532,7 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    design_system = _get_generator().generate(query, project_name)
     
     # Persist to files if requested
     if persist:
@@ -917,8 +974,6 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
@@ -948,9 +1003,7 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     # Extract style-based overrides
     if style_results:
         style = style_results[0]
-        style_name = style.get("Style Category", "")
         keywords = style.get("Keywords", "")
-        best_for = style.get("Best For", "")
         effects = style.get("Effects & Animation", "")
         
         # Infer layout from style keywords
@@ -1020,27 +1073,12 @@ def _detect_page_type(context: str, style_results: list) -> str:
     """Detect page type from context and search results."""
     context_lower = context.lower()
     
-    # Check for common page type patterns
-    page_patterns = [
-        (["dashboard", "admin", "analytics", "data", "metrics", "stats", "monitor", "overview"], "Dashboard / Data View"),
-        (["checkout", "payment", "cart", "purchase", "order", "billing"], "Checkout / Payment"),
-        (["settings", "profile", "account", "preferences", "config"], "Settings / Profile"),
-        (["landing", "marketing", "homepage", "hero", "home", "promo"], "Landing / Marketing"),
-        (["login", "signin", "signup", "register", "auth", "password"], "Authentication"),
-        (["pricing", "plans", "subscription", "tiers", "packages"], "Pricing / Plans"),
-        (["blog", "article", "post", "news", "content", "story"], "Blog / Article"),
-        (["product", "item", "detail", "pdp", "shop", "store"], "Product Detail"),
-        (["search", "results", "browse", "filter", "catalog", "list"], "Search Results"),
-        (["empty", "404", "error", "not found", "zero"], "Empty State"),
-    ]
-    
-    for keywords, page_type in page_patterns:
+    for keywords, page_type in PAGE_TYPE_PATTERNS:
         if any(kw in context_lower for kw in keywords):
             return page_type
     
     # Fallback: try to infer from style results
     if style_results:
-        style_name = style_results[0].get("Style Category", "").lower()
         best_for = style_results[0].get("Best For", "").lower()
         
         if "dashboard" in best_for or "data" in best_for:
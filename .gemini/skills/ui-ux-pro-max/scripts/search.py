@@ -16,7 +16,6 @@ Persistence (Master + Overrides pattern):
 
 import argparse
 from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
 
 
 def format_output(result):
@@ -65,6 +64,7 @@ if __name__ == "__main__":
 
     # Design system takes priority
     if args.design_system:
+        from design_system import generate_design_system
         result = generate_design_system(
             args.query, 
             args.project_name, 
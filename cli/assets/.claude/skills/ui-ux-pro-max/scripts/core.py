@@ -5,10 +5,12 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
 import re
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, defaultdict
+from types import MappingProxyType
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -95,16 +97,35 @@ _STACK_COLS = {
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
+# Keywords used to auto-detect the search domain
+_DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
+
 
 # ============ BM25 IMPLEMENTATION ============
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
 class BM25:
     """BM25 ranking algorithm for text search"""
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
+        self.term_freqs = []
+        self.length_norms = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
@@ -112,104 +133,153 @@ class BM25:
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+        text = _PUNCTUATION_RE.sub(' ', str(text).lower())
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        # Token lists are only needed to count terms, so they are not kept
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
+        self.term_freqs = [Counter(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Per-document length normalization, independent of the query
+        # (avgdl is 0 when no document has any token, e.g. blank search columns)
+        self.length_norms = [
+            self.k1 * (1 - self.b + self.b * (dl / self.avgdl if self.avgdl else 0))
+            for dl in self.doc_lengths
+        ]
+
+        # Each document's distinct terms are the keys of its term counts
+        for term_freqs in self.term_freqs:
+            for word in term_freqs:
+                self.doc_freqs[word] += 1
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
+    def score(self, query, top_n=None):
+        """Score all documents against query, best first (only the top_n if given)"""
+        query_tokens = [t for t in self.tokenize(query) if t in self.idf]
+        if not query_tokens:
+            # No query term occurs in the corpus: every document scores 0
+            return [(idx, 0) for idx in range(self.N)][:top_n]
+
         scores = []
 
-        for idx, doc in enumerate(self.corpus):
+        for idx in range(self.N):
             score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+            length_norm = self.length_norms[idx]
+            term_freqs = self.term_freqs[idx]
 
             for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+                tf = term_freqs[token]
+                idf = self.idf[token]
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + length_norm
+                score += idf * numerator / denominator
 
             scores.append((idx, score))
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        if top_n is not None and top_n >= 0:
+            # Same order as sorted(...)[:top_n] without sorting every document
+            return heapq.nlargest(top_n, scores, key=lambda x: x[1])
+        # Negative top_n (e.g. `-n -1`) keeps its slice meaning
+        return sorted(scores, key=lambda x: x[1], reverse=True)[:top_n]
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
+# Parsed CSV rows keyed by path: {filepath: (signature, rows)}
+_csv_cache = {}
+# BM25 indexes keyed by file and columns: {(filepath, search_cols): (signature, rows, bm25)}
+# A changed file replaces its entries, so both caches stay bounded by the configured files.
+_index_cache = {}
+
+
+def _file_signature(filepath):
+    """Cheap change detector for a data file: (mtime_ns, size, inode)
+
+    The inode catches files replaced by rename (e.g. editor or git checkout)
+    even when mtime and size happen to match.
+    """
+    st = filepath.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def load_csv(filepath, signature=None):
+    """Load CSV and return a tuple of read-only row mappings (cached until the file changes)
+
+    Rows are shared by every caller, so they are frozen rather than copied.
+    Pass signature when the caller has already stat'ed the file.
+    """
+    if signature is None:
+        signature = _file_signature(filepath)
+    cached = _csv_cache.get(filepath)
+    if cached and cached[0] == signature:
+        return cached[1]
+
     with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        rows = tuple(MappingProxyType(row) for row in csv.DictReader(f))
+    _csv_cache[filepath] = (signature, rows)
+    return rows
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+def _load_index(filepath, search_cols, signature):
+    """Load CSV and build its BM25 index (cached per file version and search columns)"""
+    key = (filepath, search_cols)
+    cached = _index_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
 
-    data = _load_csv(filepath)
+    data = load_csv(filepath, signature)
 
     # Build documents from search columns
     documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
     bm25 = BM25()
     bm25.fit(documents)
-    ranked = bm25.score(query)
+    _index_cache[key] = (signature, data, bm25)
+    return data, bm25
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25 (raises FileNotFoundError if filepath is missing)"""
+    # BM25 search
+    data, bm25 = _load_index(filepath, tuple(search_cols), _file_signature(filepath))
+    ranked = bm25.score(query, top_n=max_results)
 
     # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    top_rows = [data[idx] for idx, score in ranked if score > 0]
+    return [{col: row[col] for col in output_cols if col in row} for row in top_rows]
+
 
-    return results
+def clear_cache(filepath=None):
+    """Drop cached CSV rows and BM25 indexes for one data file, or for all files
+
+    Long-running callers that edit files under DATA_DIR can use this to force a
+    re-read. filepath may be relative or spelled differently from DATA_DIR / name;
+    it is compared after resolving.
+    """
+    if filepath is None:
+        _csv_cache.clear()
+        _index_cache.clear()
+        return
+
+    target = Path(filepath).resolve()
+    for path in [path for path in _csv_cache if path.resolve() == target]:
+        del _csv_cache[path]
+    for key in [key for key in _index_cache if key[0].resolve() == target]:
+        del _index_cache[key]
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
     query_lower = query.lower()
 
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
-
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
+    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in _DOMAIN_KEYWORDS.items()}
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "style"
 
@@ -222,11 +292,11 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
     filepath = DATA_DIR / config["file"]
 
-    if not filepath.exists():
+    try:
+        results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    except FileNotFoundError:
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
-
     return {
         "domain": domain,
         "query": query,
@@ -243,11 +313,11 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
 
     filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
 
-    if not filepath.exists():
+    try:
+        results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    except FileNotFoundError:
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
-
     return {
         "domain": "stack",
         "stack": stack,